@@ -3,53 +3,31 @@
 """Fractions program."""
 
 import argparse
-import enum
+import collections
 import fractions
-import logging
 import operator
 import os
 import random
-import re
 import sys
 
-from typing import Any, Callable
 
+class Operator(collections.namedtuple('Operator', ('name', 'display', 'op'))):
+  """An arithmetic operator.
 
-BinaryOp = Callable[[Any, Any], Any]
+  A plain namedtuple rather than an Enum: attribute access is a
+  C-level index instead of the Enum descriptor machinery.
+  """
 
-
-class Operator(enum.Enum):
-  """Operator Enum."""
-
-  ADD = ('+', operator.add)
-  SUB = ('-', operator.sub)
-
-  def __new__(cls, *args):
-    value = len(cls.__members__) + 1
-    obj = object.__new__(cls)
-    obj._value_ = value
-    return obj
+  __slots__ = ()
 
   @classmethod
-  def argtype(cls, s: str) -> enum.Enum:
+  def argtype(cls, s: str) -> 'Operator':
     try:
-      return cls[s]
+      return _OPERATORS[s]
     except KeyError as e:
       raise argparse.ArgumentTypeError(
           f'{s!r} is not a valid {cls.__name__}') from e
 
-  def __init__(self, display: str, op: BinaryOp):
-    self._display = display
-    self._op = op
-
-  @property
-  def display(self) -> str:
-    return self._display
-
-  @property
-  def op(self) -> BinaryOp:
-    return self._op
-
   def __repr__(self) -> str:
     return self.name
 
@@ -57,6 +35,12 @@ class Operator(enum.Enum):
     return self.display
 
 
+ADD = Operator('ADD', sys.intern('+'), operator.add)
+SUB = Operator('SUB', sys.intern('-'), operator.sub)
+
+_OPERATORS: dict[str, Operator] = {o.name: o for o in (ADD, SUB)}
+
+
 def _define_flags() -> argparse.Namespace:
   """Define the flags."""
   parser = argparse.ArgumentParser(description=__doc__)
@@ -81,12 +65,12 @@ def _define_flags() -> argparse.Namespace:
   parser.add_argument(
       '-o', '--operators',
       action='store',
-      default=[Operator.ADD],
-      choices=Operator,
+      default=[ADD],
+      choices=tuple(_OPERATORS.values()),
       type=Operator.argtype,
       nargs='+',
       help=('the operator(s) to use; choices: '
-            + ', '.join(o.name for o in Operator)),
+            + ', '.join(_OPERATORS)),
       metavar='TYPE',
   )
   parser.add_argument(
@@ -115,216 +99,368 @@ def check_flags(unused_parser, unused_args) -> None:
   return
 
 
-_WHOLE_FORMAT = re.compile(r'(?P<whole>\d+)-(?P<num>\d+)/(?P<denom>\d+)')
+def _parse_mixed(raw: str) -> tuple[int, int, int] | None:
+  """Parse '{whole}-{num}/{denom}' without the regex engine.
+
+  Two str.partition calls plus isdigit checks beat re for inputs this
+  short; the regex engine's setup cost dominates on them.
+  """
+  whole, sep1, rest = raw.partition('-')
+  num, sep2, denom = rest.partition('/')
+  if (sep1 and sep2
+      and whole.isdigit() and num.isdigit() and denom.isdigit()):
+    return int(whole), int(num), int(denom)
+  return None
+
+
+# fractions.Fraction's no-normalize fast path is a private stdlib
+# detail that changed shape in 3.12: the _normalize keyword was
+# replaced by a _from_coprime_ints classmethod. Pick the right spelling
+# once at import; fall back to the normalizing constructor if neither
+# exists.
+if hasattr(fractions.Fraction, '_from_coprime_ints'):  # Python 3.12+
+
+  def _new_coprime(cls, numerator: int, denominator: int):
+    return cls._from_coprime_ints(numerator, denominator)
+
+else:
+  try:
+    fractions.Fraction(1, 2, _normalize=False)  # Python 3.11 and older
+
+    def _new_coprime(cls, numerator: int, denominator: int):
+      return fractions.Fraction.__new__(
+          cls, numerator, denominator, _normalize=False)
+
+  except TypeError:
+
+    def _new_coprime(cls, numerator: int, denominator: int):
+      return fractions.Fraction.__new__(cls, numerator, denominator)
 
 
 class Fraction(fractions.Fraction):
 
+  __slots__ = ('_hash', '_str', '_est')
+
+  def __new__(cls, *args, **kwargs) -> 'Fraction':
+    self = super().__new__(cls, *args, **kwargs)
+    self._hash = self._str = self._est = None
+    return self
+
+  @classmethod
+  def _from_parts(cls, numerator: int, denominator: int) -> 'Fraction':
+    # Fast path for int inputs already in lowest terms; skips the
+    # constructor's type dispatch and gcd normalization.
+    self = _new_coprime(cls, numerator, denominator)
+    self._hash = self._str = self._est = None
+    return self
+
+  def __hash__(self) -> int:
+    # fractions.Fraction.__hash__ recomputes a modular inverse every
+    # call; cache it since the value is immutable.
+    h = self._hash
+    if h is None:
+      h = self._hash = super().__hash__()
+    return h
+
   @property
   def estimate(self) -> float:
-    return float(self.numerator) / self.denominator
+    e = self._est
+    if e is None:
+      e = self._est = float(self.numerator) / self.denominator
+    return e
 
   def __str__(self) -> str:
+    # Immutable, so format at most once per instance.
+    s = self._str
+    if s is not None:
+      return s
     if self.numerator >= self.denominator:
-      whole = int(self.numerator / self.denominator)
-      numerator = self.numerator % self.denominator
+      whole, numerator = divmod(self.numerator, self.denominator)
       if numerator == 0:
-        return '{0:d}'.format(whole)
-      return '{0:d}-{1}'.format(whole, Fraction(numerator, self.denominator))
-    return super().__str__()
+        s = '{0:d}'.format(whole)
+      else:
+        s = '{0:d}-{1}'.format(
+            whole, Fraction._from_parts(numerator, self.denominator))
+    else:
+      s = super().__str__()
+    self._str = s
+    return s
+
+
+def _parse_frac(raw: str) -> Fraction:
+  """Parse a plain answer: int and 'N/D' fast paths, then Fraction.
+
+  Most answers are whole numbers or a single slash; only decimals and
+  oddball inputs pay for the fractions-module string parser.
+  """
+  if raw.isdigit():
+    return Fraction._from_parts(int(raw), 1)
+  num, sep, denom = raw.partition('/')
+  if sep and num.isdigit() and denom.isdigit():
+    return Fraction(int(num), int(denom))
+  return Fraction(raw)
+
+
+_random = random.Random()
+
+
+class _RandomBuffer(object):
+  """Pre-generated random numerators and operators.
+
+  Refilling in batches via random.Random.choices amortizes the
+  per-value Python call overhead into one C call.
+  """
+
+  _BATCH = 256
+
+  def __init__(self, denominator: int, operators: list[Operator]):
+    self._denominator = denominator
+    self._operators = operators
+    self._numerators: collections.deque[int] = collections.deque()
+    self._ops: collections.deque[Operator] = collections.deque()
 
+  def next_numerator(self) -> int:
+    if not self._numerators:
+      self._numerators.extend(
+          _random.choices(range(1, self._denominator), k=2 * self._BATCH))
+    return self._numerators.popleft()
 
-def get_random_fraction(denominator: int) -> Fraction:
-  return Fraction(random.randint(1, denominator - 1), denominator)
+  def next_operator(self) -> Operator:
+    if not self._ops:
+      self._ops.extend(_random.choices(self._operators, k=self._BATCH))
+    return self._ops.popleft()
 
 
-_ENCOURAGEMENT: list[str] = [
-    'You’re on the right track now!',
-    'You’ve got it made.',
-    'That’s right!',
-    'That’s good.',
-    'I’m very proud of you.',
-    'You’re really working hard today.',
+def get_random_fraction(buf: _RandomBuffer) -> Fraction:
+  numerator = buf.next_numerator()
+  denominator = buf._denominator
+  if numerator & 1:
+    # The denominator flag only allows powers of two, so an odd
+    # numerator is already coprime; skip the constructor's gcd.
+    return Fraction._from_parts(numerator, denominator)
+  return Fraction(numerator, denominator)
+
+
+_ENCOURAGEMENT: tuple[str, ...] = (
+    "You're on the right track now!",
+    "You've got it made.",
+    "That's right!",
+    "That's good.",
+    "I'm very proud of you.",
+    "You're really working hard today.",
     'You are very good at that.',
-    'That’s coming along nicely.',
+    "That's coming along nicely.",
     'Good work!',
-    'I’m happy to see you working like that.',
-    'That’s much, much better!',
+    "I'm happy to see you working like that.",
+    "That's much, much better!",
     'Exactly right.',
-    'I’m proud of the way you worked today.',
-    'You’re doing that much better today.',
-    'You’ve just about got it.',
-    'That’s the best you’ve ever done.',
-    'You’re doing a good job.',
-    'That’s it!',
-    'Now you’ve figured it out.',
-    'That’s quite an improvement.',
+    "I'm proud of the way you worked today.",
+    "You're doing that much better today.",
+    "You've just about got it.",
+    "That's the best you've ever done.",
+    "You're doing a good job.",
+    "That's it!",
+    "Now you've figured it out.",
+    "That's quite an improvement.",
     'Great!',
     'I knew you could do it.',
     'Congratulations!',
     'Not bad.',
     'Keep working on it.',
-    'You’re improving.',
+    "You're improving.",
     'Now you have it!',
     'You are learning fast.',
     'Good for you!',
-    'Couldn’t have done it better myself.',
-    'Aren’t you proud of yourself?',
-    'One more time and you’ll have it.',
+    "Couldn't have done it better myself.",
+    "Aren't you proud of yourself?",
+    "One more time and you'll have it.",
     'You really make my job fun.',
-    'That’s the right way to do it.',
-    'You’re getting better every day.',
+    "That's the right way to do it.",
+    "You're getting better every day.",
     'You did it that time!',
-    'That’s not half bad.',
+    "That's not half bad.",
     'Nice going.',
-    'You haven’t missed a thing!',
+    "You haven't missed a thing!",
     'Wow!',
-    'That’s the way!',
+    "That's the way!",
     'Keep up the good work.',
     'Terrific!',
     'Nothing can stop you now.',
-    'That’s the way to do it.',
+    "That's the way to do it.",
     'Sensational!',
-    'You’ve got your brain in gear today.',
-    'That’s better.',
+    "You've got your brain in gear today.",
+    "That's better.",
     'That was first class work.',
     'Excellent!',
-    'That’s the best ever.',
-    'You’ve just about mastered it.',
+    "That's the best ever.",
+    "You've just about mastered it.",
     'Perfect!',
-    'That’s better than ever.',
+    "That's better than ever.",
     'Much better!',
     'Wonderful!',
     'You must have been practicing.',
     'You did that very well.',
     'Fine!',
     'Nice going.',
-    'You’re really going to town.',
+    "You're really going to town.",
     'Outstanding!',
     'Fantastic!',
     'Tremendous!',
-    'That’s how to handle that.',
-    'Now that’s what I call a fine job.',
-    'That’s great.',
+    "That's how to handle that.",
+    "Now that's what I call a fine job.",
+    "That's great.",
     'Right on!',
-    'You’re really improving.',
-    'You’re doing beautifully!',
+    "You're really improving.",
+    "You're doing beautifully!",
     'Superb!',
     'Good remembering.',
-    'You’ve got that down pat.',
+    "You've got that down pat.",
     'You certainly did well today.',
     'Keep it up!',
     'Congratulations. You got it right!',
     'You did a lot of work today.',
     'Well look at you go.',
-    'That’s it.',
+    "That's it.",
     'I like knowing you.',
     'Marvelous!',
     'I like that.',
     'Way to go!',
     'Now you have the hang of it.',
-    'You’re doing fine!',
+    "You're doing fine!",
     'Good thinking.',
     'You are really learning a lot.',
     'Good going.',
-    'I’ve never seen anyone do it better.',
+    "I've never seen anyone do it better.",
     'Keep on trying.',
     'You outdid yourself today!',
     'Good for you!',
-    'I think you’ve got it now.',
-    'That’s a good (boy/girl).',
-    'Good job, (person’s name).',
+    "I think you've got it now.",
+    "That's a good (boy/girl).",
+    "Good job, (person's name).",
     'You figured that out fast.',
     'You remembered!',
-    'That’s really nice.',
+    "That's really nice.",
     'That kind of work makes me happy.',
-]
+)
+
+_ENC_LEN = len(_ENCOURAGEMENT)
+
+
+def _fast_input(prompt: str) -> str:
+  """input() without its stderr flush and empty-write overhead."""
+  sys.stdout.write(prompt)
+  sys.stdout.flush()
+  line = sys.stdin.readline()
+  if not line:
+    raise EOFError
+  return line.rstrip('\n')
+
+
+# On a tty keep the real input() for readline editing/history; the
+# fast path is for piped or scripted stdin.
+_input = input if sys.stdin.isatty() else _fast_input
 
 
 class Guess(object):
   """A Guess."""
 
+  __slots__ = ('left', 'right', 'want', 'op', 'n', '_prompt')
+
   left: Fraction
   right: Fraction
-  want: Fraction
+  want: Fraction | None
   op: Operator
   n: int
 
   def __init__(self):
-    self.reset(Fraction(0), Fraction(0), Operator.ADD)
+    # The remaining attributes are populated by the first reset, which
+    # main always calls before prompting. want starts as None so a ^C
+    # delivered before that reset finishes finds a bound attribute.
+    self.want = None
+    self.n = 0
 
   def reset(self, left: Fraction, right: Fraction, op: Operator):
-    want = Fraction(op.op(left, right))
-    if want >= 0:
-      self.left, self.right = left, right
-      self.want = want
-    else:
-      self.left, self.right = right, left
-      self.want = -want
+    # op.op on two Fractions already yields a normalized result, so
+    # rebuild it as our subclass without rerunning the constructor's
+    # dispatch and gcd.
+    want = op.op(left, right)
+    if want < 0:
+      left, right = right, left
+      want = -want
+    self.left, self.right = left, right
+    self.want = Fraction._from_parts(want.numerator, want.denominator)
     self.op = op
     self.n = 0
+    # left/right/op are fixed until the next reset; format the prompt
+    # once so retries don't re-stringify the operands.
+    self._prompt = f'What is {self.left} {op.display} {self.right}? '
 
   def prompt(self) -> str:
     self.n += 1
-    return input(f'What is {self.left} {self.op} {self.right}? ').strip()
+    return _input(self._prompt).strip()
 
 
 def main(args: argparse.Namespace) -> int:
   repeat: bool = False
+  buf: _RandomBuffer = _RandomBuffer(args.denominator, args.operators)
   guess: Guess = Guess()
   interrupts: int = 0
   correct: int = 0
   incorrect: int = 0
   skipped: int = 0
-  print('Answers in the format of: {whole}-{numerator}/{denominator}')
-  print(' (simplified required)'
-        if args.canonical else
-        ' (1-1/4, 1.25, 5/4, 1-2/8 OK)')
-  print('[Press ^C to move to the next question]')
-  print('[Press ^D to quit]')
-  print('')
+  # One buffered write instead of five print calls.
+  sys.stdout.write(
+      'Answers in the format of: {whole}-{numerator}/{denominator}\n'
+      + (' (simplified required)\n'
+         if args.canonical else
+         ' (1-1/4, 1.25, 5/4, 1-2/8 OK)\n')
+      + '[Press ^C to move to the next question]\n'
+        '[Press ^D to quit]\n'
+        '\n')
   first = True
   while True:
     try:
       if not repeat or first:
         guess.reset(
-            get_random_fraction(args.denominator),
-            get_random_fraction(args.denominator),
-            random.choice(args.operators))
+            get_random_fraction(buf),
+            get_random_fraction(buf),
+            buf.next_operator())
+        # Retries re-ask the same question; format the target and the
+        # success-message suffixes once.
+        want_str = str(guess.want)
+        want_parens = '' if args.canonical else f' ({want_str})'
+        want_est = f' [{guess.want.estimate}]' if args.estimate else ''
       first = False
       raw = guess.prompt()
       interrupts = 0
-      m = _WHOLE_FORMAT.match(raw)
+      parts = _parse_mixed(raw)
       got: Fraction
-      if m:
-        whole = int(m.group('whole'))
-        num = int(m.group('num'))
-        denom = int(m.group('denom'))
+      if parts:
+        whole, num, denom = parts
         got = Fraction((whole*denom)+num, denom)
       else:
-        got = Fraction(raw)
-      if ((args.canonical and raw == f'{guess.want}')      # String
+        got = _parse_frac(raw)
+      if ((args.canonical and raw == want_str)             # String
           or (not args.canonical and got == guess.want)):  # Value
-        print('✔️  '
-              + random.choice(_ENCOURAGEMENT)
-              + (f' ({guess.want})' if not args.canonical else '')
-              + (f' [{guess.want.estimate}]' if args.estimate else ''))
+        msg = ('✔️  ' + _ENCOURAGEMENT[_random.randrange(_ENC_LEN)]
+               + want_parens + want_est)
         correct += 1
         repeat = False
       else:
-        print('❌ Try again! '
-              + ('Simplify your answer. '
-                 if args.canonical and got == guess.want else '')
-              + '^C to move on.')
+        msg = '❌ Try again! '
+        if args.canonical and got == guess.want:
+          msg += 'Simplify your answer. '
+        msg += '^C to move on.'
         incorrect += 1
         repeat = True
-      print('')
+      print(msg + '\n')
     except ValueError:
       repeat = True
       continue
     except KeyboardInterrupt:
       print('')
-      print(f'Wanted {guess.want}!\n')
+      if guess.want is not None:
+        print(f'Wanted {guess.want}!\n')
       interrupts += 1
       skipped += 1
       repeat = False
@@ -346,8 +482,12 @@ def main(args: argparse.Namespace) -> int:
 
 if __name__ == '__main__':
   a = _define_flags()
-  logging.basicConfig(
-      level=a.verbosity,
-      datefmt='%Y/%m/%d %H:%M:%S',
-      format='[%(asctime)s] %(levelname)s: %(message)s')
+  if a.verbosity < 20:
+    # Nothing logs at INFO or above, so only pay for the logging
+    # import and handler setup when debugging is requested.
+    import logging
+    logging.basicConfig(
+        level=a.verbosity,
+        datefmt='%Y/%m/%d %H:%M:%S',
+        format='[%(asctime)s] %(levelname)s: %(message)s')
   sys.exit(main(a))